@@ -4,6 +4,7 @@ import scipy
 from pmana.purity.config import DEFAULT_ANALYSIS_CONFIGURATION, CALIBRATION_CHANGES_COLDBOX, ResolveConfiguration
 
 from pmana.utils.io import ExtractSingleMeasurement
+from pmana.utils.fitting import JACOBIANS
 
 def ExtractICPeak(
     MeasurementPath,
@@ -157,6 +158,7 @@ def ExtractICPeak(
             xIC[(xIC > IC_Pos - GAUS_FIT_LIMITS[0]) & (xIC < IC_Pos + GAUS_FIT_LIMITS[1])], 
             IC[(xIC > IC_Pos - GAUS_FIT_LIMITS[0]) & (xIC < IC_Pos + GAUS_FIT_LIMITS[1])], 
             p0 = (IC[IC_Pos_Idx], xIC[IC_Pos_Idx], 0.1),
+            jac = JACOBIANS.get(ICFitFunction), ###< analytic, when known
             maxfev = 2000
         ) 
         errs = numpy.sqrt(numpy.diag(covs))
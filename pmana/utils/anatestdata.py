@@ -1,19 +1,46 @@
 import os
-import glob
+import inspect
+import functools
+import concurrent.futures
 import numpy
 import pandas
-import scipy
 import pathlib
 import datetime
 
 from pmana.utils.io import ExtractSingleMeasurement, ExtractFileTimes
-from pmana.utils.fitting import Gaus
+from pmana.utils.fitting import FitGaus, FitGausBatch, GausInitialGuess, GausLogFit
+
+def _AnalyzeMeasurements(
+    Analyze,
+    MeasurementPaths,
+    N_WORKERS = 1,
+    WARM_START = False
+):
+    """
+        Run the analyzer over a list of measurements, either serially or
+        spread over `N_WORKERS` processes (`None` uses all cores).
+        Serially and with `WARM_START`, an analyzer accepting `P0_CACHE`
+        is given the fit parameters of the previous measurement,
+        as a fallback initial guess.
+    """
+
+    if N_WORKERS is None or N_WORKERS > 1:
+        with concurrent.futures.ProcessPoolExecutor(max_workers=N_WORKERS) as Executor:
+            return list(Executor.map(Analyze, MeasurementPaths, chunksize=4))
+
+    if WARM_START and "P0_CACHE" in inspect.signature(Analyze).parameters:
+        P0Cache = {}
+        return [Analyze(MeasurementPath, P0_CACHE=P0Cache) for MeasurementPath in MeasurementPaths]
+
+    return [Analyze(MeasurementPath) for MeasurementPath in MeasurementPaths]
 
 def Iterate(
     CampaignPath,
     Analyze,
     TimeMapping,
-    DIR_KEY = '0*'
+    DIR_KEY = '0*',
+    N_WORKERS = 1,
+    WARM_START = False
 ):
     """
         Input
@@ -27,6 +54,16 @@ def Iterate(
         TimeMapping : dataframe
                       Mapping between times and filenames.
 
+        N_WORKERS : int or None, optional
+                    Number of processes analyzing measurements in parallel,
+                    `None` uses all cores. `Analyze` must be picklable
+                    (e.g., a module-level function or a functools.partial).
+
+        WARM_START : bool, optional
+                     Whether to carry fit parameters over between consecutive
+                     measurements, as fallback initial guesses, if `Analyze`
+                     accepts `P0_CACHE`. Only used serially.
+
         Output
         ---
         Provides an array with the results.
@@ -35,28 +72,49 @@ def Iterate(
     CampaignPath = pathlib.Path(CampaignPath)
 
     Output = []
+    MeasurementPaths = []
+    FileNames = []
+    Times = []
 
-    # loop over measurements in the campaign
-    for MeasurementPath in CampaignPath.glob(DIR_KEY):
+    # loop over measurements in the campaign, in order
+    for MeasurementPath in sorted(CampaignPath.glob(DIR_KEY)):
 
-        # analyze the measurement
-        CHOutput = Analyze(MeasurementPath)
+        # measurements are directories, skip anything else
+        if not MeasurementPath.is_dir():
+            continue
 
         # get the measurement time
         if TimeMapping is not None: 
-            MeasurementPaths = glob.glob(str(MeasurementPath) + "/*")
-            if not MeasurementPaths:
+            FirstFile = next(
+                (f for f in MeasurementPath.iterdir() if not f.name.startswith('.')),
+                None
+            )
+            if FirstFile is None:
                 print(f"No time mapping for {MeasurementPath}")
                 continue
-            t = TimeMapping[TimeMapping['FileName'] == os.path.basename(MeasurementPaths[0])].iloc[0]['Date']
+            FileNames.append(FirstFile.name)
         else:
-            t = datetime.datetime.strptime(
-                os.path.basename(MeasurementPath), 
+            Times.append(datetime.datetime.strptime(
+                MeasurementPath.name, 
                 "%Y%m%d_%H%M%S"
-            )
+            ))
+
+        MeasurementPaths.append(MeasurementPath)
+
+    # map files to times in one go, keeping the first entry for each file
+    if TimeMapping is not None:
+        Times = TimeMapping.drop_duplicates('FileName') \
+            .set_index('FileName')['Date'] \
+            .reindex(FileNames) \
+            .to_list()
+
+    # analyze the measurements
+    CHOutputs = _AnalyzeMeasurements(Analyze, MeasurementPaths, N_WORKERS, WARM_START)
+
+    for MeasurementPath, t, CHOutput in zip(MeasurementPaths, Times, CHOutputs):
 
         # get measurement number
-        n = int(os.path.basename(MeasurementPath))
+        n = int(MeasurementPath.name)
 
         CHOutput.extend([t, n])
         Output.append(CHOutput)
@@ -67,7 +125,9 @@ def IterateCERN(
     CampaignPath,
     Analyze,
     YEAR = 2025,
-    MONTH = 12
+    MONTH = 12,
+    N_WORKERS = 1,
+    WARM_START = False
 ):
     """
         In the CERN data structure, directory tells the time.
@@ -81,6 +141,13 @@ def IterateCERN(
         Analyze : function
                   Analyzer function acting on a measurement.
 
+        N_WORKERS : int or None, optional
+                    Number of processes analyzing measurements in parallel,
+                    `None` uses all cores.
+
+        WARM_START : bool, optional
+                     See `Iterate`.
+
         Output
         ---
         Provides an array with the results.
@@ -89,23 +156,23 @@ def IterateCERN(
     CampaignPath = pathlib.Path(CampaignPath)
 
     Output = []
+    MeasurementPaths = []
+    Times = []
 
     # days
     for DayPath in CampaignPath.glob('*'):
-        if not os.path.basename(DayPath).isnumeric():
+        DayName = DayPath.name
+        if not DayName.isnumeric():
             continue 
-        Day = int(os.path.basename(DayPath))
+        Day = int(DayName)
 
         # hours
         for HourPath in DayPath.glob("*"):
-            Hour = int(os.path.basename(HourPath))
+            Hour = int(HourPath.name)
 
             # minutes
             for MinutePath in HourPath.glob("*"):
-                Minute = int(os.path.basename(MinutePath))
-
-                # analyze the measurement
-                CHOutput = Analyze(MinutePath)
+                Minute = int(MinutePath.name)
 
                 ### extract date
                 t = datetime.datetime(
@@ -115,8 +182,20 @@ def IterateCERN(
                     hour = Hour, 
                     minute = Minute)
 
-                CHOutput.extend([t])
-                Output.append(CHOutput)
+                MeasurementPaths.append(MinutePath)
+                Times.append(t)
+
+    # go over measurements in time order
+    Order = sorted(range(len(Times)), key=Times.__getitem__)
+    MeasurementPaths = [MeasurementPaths[k] for k in Order]
+    Times = [Times[k] for k in Order]
+
+    # analyze the measurements
+    CHOutputs = _AnalyzeMeasurements(Analyze, MeasurementPaths, N_WORKERS, WARM_START)
+
+    for t, CHOutput in zip(Times, CHOutputs):
+        CHOutput.extend([t])
+        Output.append(CHOutput)
                 
     return Output
 
@@ -131,7 +210,9 @@ def GaussianFitToChannel(
     TESTPULSE_LOW_LIM = 1.25,
     SKIP_NROWS = 0,
     BINNAME = 'BinCenter',
-    COUNTNAME = 'Population'
+    COUNTNAME = 'Population',
+    P0_CACHE = None,
+    BATCH_FIT = False
 ):
     """
         Analyze a single measurement, extracting for each channel
@@ -151,6 +232,15 @@ def GaussianFitToChannel(
 
         COUNTNAME : string, optional
 
+        P0_CACHE : dict, optional
+                   Fit parameters per channel from a previous measurement,
+                   used as last-resort initial guesses and updated in place.
+
+        BATCH_FIT : bool, optional
+                    Whether to fit all channels sharing the same bins
+                    at once, falling back to single-channel fits
+                    for those not converging.
+
         Output
         ---
         Provides a Pandas dataframe with the results.
@@ -175,61 +265,106 @@ def GaussianFitToChannel(
 
     print(f"[GaussianFitToChannel] Extracted {len(Data)} channels from {MeasurementPath}.")
 
+    # prepare channels and their initial guesses
+    Channels = []
     for i, CHData in enumerate(Data):
 
+        # binned channel data: data is already binned, one row per bin
+        x = CHData[BINNAME].to_numpy(dtype=numpy.float64)
+        y = CHData[COUNTNAME].to_numpy(dtype=numpy.float64)
+
         if SKIP_NROWS > 0:
-            CHData = CHData.iloc[SKIP_NROWS:].reset_index(drop=True)
+            x = x[SKIP_NROWS:]
+            y = y[SKIP_NROWS:]
 
         # dedicated test-pulse analysis        
         if MASK_TESTPULSE:
-            CHData = CHData[CHData[BINNAME] > TESTPULSE_LOW_LIM].reset_index(drop=True)
+            mask = x > TESTPULSE_LOW_LIM
+            x = x[mask]
+            y = y[mask]
 
         # avoid empty channels
-        if len(CHData) < 10:
+        if len(x) < 10:
             continue
-        
-        # adaptively extract bin edges
-        Diffs = numpy.diff(sorted(CHData[BINNAME]))
-        BinWidth = round(numpy.median(Diffs), 6)
-        BinEdges = numpy.append(CHData[BINNAME] - BinWidth / 2, CHData[BINNAME].iloc[-1] + BinWidth / 2)
+
         if rebin:
-            BinEdges = BinEdges[::2]
+            y = y[:len(y) // 2 * 2].reshape(-1, 2).sum(axis=1)
+            x = 0.5 * (x[:len(y) * 2:2] + x[1:len(y) * 2:2])
+
+        # extract channel features: peak height, position (in ticks) and width
+        Guess = GausInitialGuess(x, y)
+        if Guess is None:
+            Channels.append((i, x, y, None))
+            continue
 
-        # binned channel data
-        y, bins = numpy.histogram(
-            CHData[BINNAME],
-            bins = BinEdges,
-            weights = CHData[COUNTNAME]
+        # initial guesses from the data, preferring the closed-form fit
+        # in log space, then the previous measurement's fit (if any)
+        Guesses = [Guess]
+        LogGuess = GausLogFit(x, y)
+        if LogGuess is not None:
+            Guesses.insert(0, LogGuess)
+        if P0_CACHE is not None and i in P0_CACHE:
+            Guesses.append(P0_CACHE[i])
+
+        Channels.append((i, x, y, Guesses))
+
+    # fit channels sharing the same bins all at once,
+    # leaving those not converging to the single-channel fit
+    BatchFits = {}
+    Fittable = [Channel for Channel in Channels if Channel[3] is not None]
+    if BATCH_FIT and Fittable:
+        xRef = Fittable[0][1]
+        Batch = [Channel for Channel in Fittable if numpy.array_equal(Channel[1], xRef)]
+        P, E, Converged = FitGausBatch(
+            xRef,
+            numpy.stack([Channel[2] for Channel in Batch]),
+            numpy.stack([Channel[3][0] for Channel in Batch])
         )
-        x = (bins[:-1] + bins[1:]) / 2
+        for (i, _, _, _), pars, errs, ok in zip(Batch, P, E, Converged):
+            if ok:
+                BatchFits[i] = (pars, errs)
 
-        # extract channel features
-        idxMax = numpy.argmax(y); posMax = x[idxMax] ###< peak position in ticks
+    for i, x, y, Guesses in Channels:
 
-        indices = numpy.where(y > 0.1 * max(y))[0]
-        if len(indices) < 2:
+        if Guesses is None:
             if debug:
                 print(f"[Analyze] Channel {i}: insufficient bins above threshold, skipping")
             Output.extend([numpy.nan, numpy.nan, numpy.nan, numpy.nan])
             continue
 
-        std = (x[indices[-1]] - x[indices[0]]) / 2.355
+        _, posMax, std = Guesses[-1]
 
         # perform Gaussian fit of channel
-        try:
-            pars, covs = scipy.optimize.curve_fit(
-                Gaus, 
-                x,
-                y,
-                p0 = (numpy.max(CHData[COUNTNAME]), posMax, std),
-                maxfev=1000
-            )
-            errs = numpy.sqrt(numpy.diag(covs))
-        except RuntimeError:
-            print(f"[Analyze] Could not perform fit here: {MeasurementPath}, {i}")
-            print(f"[Analyze] Initial guesses: {idxMax}, {std}")
-            pars = [numpy.nan, numpy.nan, numpy.nan]
-            pars = [numpy.nan, numpy.nan, numpy.nan]
+        if i in BatchFits:
+            pars, errs = BatchFits[i]
+        else:
+            for p0 in Guesses:
+                if not numpy.all(numpy.isfinite(p0)):
+                    continue
+                try:
+                    pars, errs = FitGaus(
+                        x,
+                        y,
+                        p0 = p0,
+                        MAXFEV = 1000
+                    )
+                except RuntimeError:
+                    continue
+                # reject peaks outside the fitted bins
+                if x.min() <= pars[1] <= x.max():
+                    break
+            else:
+                print(f"[Analyze] Could not perform fit here: {MeasurementPath}, {i}")
+                print(f"[Analyze] Initial guesses: {posMax}, {std}")
+                pars = [numpy.nan, numpy.nan, numpy.nan]
+                errs = [numpy.nan, numpy.nan, numpy.nan]
+
+        # the fitting function only depends on the width squared
+        pars = numpy.array(pars, dtype=numpy.float64)
+        pars[2] = abs(pars[2])
+
+        if P0_CACHE is not None and numpy.all(numpy.isfinite(pars)):
+            P0_CACHE[i] = pars
 
         if debug:
             print(f"[Analyze] Peak position: {posMax}")
@@ -254,35 +389,70 @@ def DumpCampaigns(
 
         Output
         ---
-        Provides an array table with paths from all campaigns.
+        Yields the paths of each campaign, one campaign at a time.
         Ordering: data, times, temperatures.
     """
 
-    CampaignFiles = []
-
     # go over measurements
-    for MeasurementPath in DataPath.glob("[!.]*"):
+    with os.scandir(DataPath) as MeasurementEntries:
+        for MeasurementEntry in MeasurementEntries:
+            if MeasurementEntry.name.startswith('.') or not MeasurementEntry.is_dir():
+                continue
 
-        # for each measurement, get the files
-        for MeasurementElement in MeasurementPath.glob("[!.]*"):
+            Data = TimeMapping = TemperatureMapping = None
 
-            if "Time" in MeasurementElement.name:
-                TimeMapping        = MeasurementElement
-            elif "Temperature" in MeasurementElement.name:
-                TemperatureMapping = MeasurementElement
-            else:
-                Data               = MeasurementElement
+            # for each measurement, get the files
+            with os.scandir(MeasurementEntry.path) as MeasurementElements:
+                for MeasurementElement in MeasurementElements:
+
+                    Name = MeasurementElement.name
+                    if Name.startswith('.'):
+                        continue
+                    elif "Time" in Name:
+                        TimeMapping        = MeasurementElement.path
+                    elif "Temperature" in Name:
+                        TemperatureMapping = MeasurementElement.path
+                    else:
+                        Data               = MeasurementElement.path
+
+            yield [Data, TimeMapping, TemperatureMapping]
+
+def _AnalyzeCampaignFiles(
+    CampaignFiles,
+    AnalyzeTimes,
+    AnalyzeTemperatures,
+    AnalyzeCampaign,
+    AnalyzeMeas
+):
+    """
+        Analyze a single campaign, given its (data, times, temperatures)
+        paths. Returns the campaign output and its temperatures.
+    """
+
+    PATH_CAMPAIGN, PATH_TIMES, PATH_TEMPERATURES = CampaignFiles
 
-        CampaignFiles.append([Data, TimeMapping, TemperatureMapping])
+    # get time mapping
+    TimeMapping  = AnalyzeTimes(PATH_TIMES)
 
-    return CampaignFiles
+    # get temperature mapping
+    Temperatures = AnalyzeTemperatures(PATH_TEMPERATURES)
+
+    # analyze campaign
+    Output       = AnalyzeCampaign(
+        PATH_CAMPAIGN,   ###< path to restructured data
+        AnalyzeMeas,     ###< analyzing module 
+        TimeMapping      ###< file-to-time mapping
+    )
+
+    return Output, Temperatures
 
 def MergeCampaigns(
     DataPath,
     AnalyzeTimes,
     AnalyzeTemperatures,
     AnalyzeCampaign,
-    AnalyzeMeas
+    AnalyzeMeas,
+    N_WORKERS = 1
 ):
     """
         Input
@@ -299,6 +469,11 @@ def MergeCampaigns(
         AnalyzeCampaign : func
                           Module that runs the analysis over a campaign.
 
+        N_WORKERS : int or None, optional
+                    Number of processes analyzing campaigns in parallel,
+                    `None` uses all cores. Keep `AnalyzeCampaign` serial
+                    within each campaign when using this.
+
         Output
         ---
         Provides an array with all measurements and a pandas DataFrame temperatures.
@@ -307,30 +482,27 @@ def MergeCampaigns(
     MergedOutput       = []
     MergedTemperatures = []
 
-    # get files for each campaign
+    # get files for each campaign, lazily
     # ordering: data, times, temperatures
     DataPath      = pathlib.Path(DataPath)
     CampaignFiles = DumpCampaigns(DataPath)
 
-    for Files in zip(CampaignFiles):
-
-        PATH_CAMPAIGN     = Files[0][0]
-        PATH_TIMES        = Files[0][1]
-        PATH_TEMPERATURES = Files[0][2]
-
-        # get time mapping
-        TimeMapping  = AnalyzeTimes(PATH_TIMES)
-
-        # get temperature mapping
-        Temperatures = AnalyzeTemperatures(PATH_TEMPERATURES)
+    AnalyzeCampaignFiles = functools.partial(
+        _AnalyzeCampaignFiles,
+        AnalyzeTimes        = AnalyzeTimes,
+        AnalyzeTemperatures = AnalyzeTemperatures,
+        AnalyzeCampaign     = AnalyzeCampaign,
+        AnalyzeMeas         = AnalyzeMeas
+    )
 
-        # analyze campaign
-        Output       = AnalyzeCampaign(
-            PATH_CAMPAIGN,   ###< path to restructured data
-            AnalyzeMeas,     ###< analyzing module 
-            TimeMapping      ###< file-to-time mapping
-        )
+    # analyze campaigns, independent of each other
+    if N_WORKERS is None or N_WORKERS > 1:
+        with concurrent.futures.ProcessPoolExecutor(max_workers=N_WORKERS) as Executor:
+            Results = list(Executor.map(AnalyzeCampaignFiles, CampaignFiles))
+    else:
+        Results = map(AnalyzeCampaignFiles, CampaignFiles)
 
+    for Output, Temperatures in Results:
         MergedOutput.extend(Output)
         MergedTemperatures.append(Temperatures)
 
@@ -339,4 +511,4 @@ def MergeCampaigns(
         ignore_index = True
     )
 
-    return MergedOutput, MergedTemperatures
\ No newline at end of file
+    return MergedOutput, MergedTemperatures
@@ -1,4 +1,5 @@
 import numpy
+import scipy
 
 def Gaus(
     x, 
@@ -12,6 +13,274 @@ def Gaus(
 
     return A * numpy.exp(- (x - Mu)**2 / (2 * S**2))
 
+def GausJac(
+    x,
+    A,
+    Mu,
+    S
+):
+    """
+        Analytic Jacobian of the simple Gaussian fitting function,
+        with respect to the parameters (A, Mu, S).
+    """
+
+    e = numpy.exp(- (x - Mu)**2 / (2 * S**2))
+
+    return numpy.stack([
+        e,
+        A * e * (x - Mu) / S**2,
+        A * e * (x - Mu)**2 / S**3
+    ], axis=1)
+
+def GausResidualJac(
+    x,
+    y,
+    A,
+    Mu,
+    S,
+    J
+):
+    """
+        Residuals of the simple Gaussian fitting function with respect to y.
+        Fills the Jacobian J, shaped (len(x), 3), in place, evaluating
+        the exponential only once for both.
+    """
+
+    d = x - Mu
+    numpy.exp(- d**2 / (2 * S**2), out=J[:, 0])
+    numpy.multiply(J[:, 0], d, out=J[:, 1])
+    J[:, 1] *= A / S**2
+    numpy.multiply(J[:, 1], d, out=J[:, 2])
+    J[:, 2] /= S
+
+    return A * J[:, 0] - y
+
+def GausInitialGuess(
+    x,
+    y,
+    THRESHOLD = 0.1
+):
+    """
+        Initial guesses (A, Mu, S) for the simple Gaussian fitting function:
+        peak height and position, and a width from the outermost bins
+        above `THRESHOLD` times the peak height.
+        Returns None if fewer than two bins are above threshold.
+    """
+
+    idxMax = numpy.argmax(y)
+    Above = y > THRESHOLD * y[idxMax]
+    Low = numpy.argmax(Above)
+    High = len(y) - 1 - numpy.argmax(Above[::-1])
+    if not Above[Low] or High <= Low:
+        return None
+
+    return y[idxMax], x[idxMax], (x[High] - x[Low]) / 2.355
+
+def GausMoments(
+    x,
+    y,
+    THRESHOLD = 0.1
+):
+    """
+        Estimate of (A, Mu, S) for the simple Gaussian fitting function
+        from the weighted moments of the bins above `THRESHOLD` times
+        the peak height.
+        Returns None if fewer than two bins are above threshold.
+    """
+
+    yMax = numpy.max(y)
+    mask = y > max(THRESHOLD * yMax, 0)
+    if numpy.count_nonzero(mask) < 2:
+        return None
+
+    w = y[mask]
+    Mu = numpy.dot(x[mask], w) / w.sum()
+    S = numpy.sqrt(numpy.dot((x[mask] - Mu)**2, w) / w.sum())
+
+    return yMax, Mu, S
+
+def FitGausBatch(
+    x,
+    Y,
+    P0,
+    MAXITER = 20,
+    TOL = 1e-8
+):
+    """
+        Least-squares fit of the simple Gaussian fitting function to
+        several spectra sharing the same x grid, solving the damped
+        (Levenberg-Marquardt) steps of all spectra at once.
+
+        Input
+        ---
+        x : array-like
+            Common bin centers, shaped (N,).
+
+        Y : array-like
+            Spectra to be fitted, shaped (K, N).
+
+        P0 : array-like
+             Initial guesses for (A, Mu, S), shaped (K, 3).
+
+        MAXITER : int, optional
+                  Maximum number of iterations.
+
+        TOL : float, optional
+              Relative step size below which a fit has converged.
+
+        Output
+        ---
+        Returns the fit parameters and their errors, shaped (K, 3),
+        and a boolean mask of the spectra whose fit converged
+        to a finite peak within x, with positive width and
+        a residual sum of squares no worse than at P0.
+    """
+
+    x = numpy.asarray(x, dtype=numpy.float64)
+    Y = numpy.asarray(Y, dtype=numpy.float64)
+    P = numpy.array(P0, dtype=numpy.float64)
+
+    def ResidualJac(P):
+        A, Mu, S = (P[:, k, None] for k in range(3))
+        d = x - Mu
+        E = numpy.exp(- d**2 / (2 * S**2))
+        dMu = A * E * d / S**2
+        J = numpy.stack([E, dMu, dMu * d / S], axis=2)
+        return Y - A * E, J
+
+    R, J = ResidualJac(P)
+    Cost = numpy.einsum('kn,kn->k', R, R)
+    Cost0 = Cost.copy()
+    Lambda = numpy.full(len(P), 1e-3)
+    Converged = numpy.zeros(len(P), dtype=bool)
+    for _ in range(MAXITER):
+        JtJ = numpy.einsum('kni,knj->kij', J, J)
+        Jtr = numpy.einsum('kni,kn->ki', J, R)
+
+        # damp the steps, scaling with the curvature of each parameter
+        Damped = JtJ + Lambda[:, None, None] * numpy.diagonal(JtJ, axis1=1, axis2=2)[:, :, None] * numpy.eye(3)
+        dP = (numpy.linalg.pinv(Damped) @ Jtr[:, :, None])[:, :, 0]
+
+        # only take the steps lowering the residuals, damping more the others
+        RNew, JNew = ResidualJac(P + dP)
+        CostNew = numpy.einsum('kn,kn->k', RNew, RNew)
+        Better = numpy.isfinite(CostNew) & (CostNew < Cost) & ~Converged
+        Converged |= numpy.all(numpy.abs(dP) <= TOL * (numpy.abs(P) + TOL), axis=1) & (CostNew <= Cost)
+        P[Better] += dP[Better]
+        R[Better], J[Better], Cost[Better] = RNew[Better], JNew[Better], CostNew[Better]
+        Lambda = numpy.where(Better, Lambda / 10, Lambda * 10)
+
+        if Converged.all():
+            break
+
+    # covariance as in scipy.optimize.curve_fit, scaled by the residual variance
+    R, J = ResidualJac(P)
+    covs = numpy.linalg.pinv(numpy.einsum('kni,knj->kij', J, J)) \
+        * (numpy.einsum('kn,kn->k', R, R) / max(Y.shape[1] - 3, 1))[:, None, None]
+    errs = numpy.sqrt(numpy.diagonal(covs, axis1=1, axis2=2))
+
+    # only keep sensible peaks, leaving the others to single-channel fits
+    Converged &= numpy.all(numpy.isfinite(P), axis=1) & numpy.all(numpy.isfinite(errs), axis=1)
+    Converged &= (P[:, 1] >= x.min()) & (P[:, 1] <= x.max()) & (P[:, 2] > 0) & (Cost <= Cost0)
+
+    return P, errs, Converged
+
+def GausLogFit(
+    x,
+    y,
+    THRESHOLD = 0.1
+):
+    """
+        Closed-form estimate of (A, Mu, S) for the simple Gaussian fitting
+        function: log(y) is quadratic in x, so a quadratic fit weighted by y
+        over the bins above `THRESHOLD` times the peak height gives the
+        parameters in one linear solve.
+        Returns None if these bins do not describe a finite
+        peak within them.
+    """
+
+    mask = y > max(THRESHOLD * numpy.max(y), 0)
+    if numpy.count_nonzero(mask) < 3:
+        return None
+
+    # center x for a better-conditioned fit
+    xMean = numpy.mean(x[mask])
+    c2, c1, c0 = numpy.polyfit(x[mask] - xMean, numpy.log(y[mask]), 2, w=y[mask])
+    if not c2 < 0:
+        return None
+
+    S2 = - 1 / (2 * c2)
+    Mu = c1 * S2
+    with numpy.errstate(over='ignore'):
+        Guess = (numpy.exp(c0 + Mu**2 / (2 * S2)), Mu + xMean, numpy.sqrt(S2))
+
+    # nearly flat bins give no usable peak, e.g. overflowing or outside the bins
+    if not numpy.all(numpy.isfinite(Guess)) or not x[mask].min() <= Guess[1] <= x[mask].max():
+        return None
+
+    return Guess
+
+def FitGaus(
+    x,
+    y,
+    p0,
+    MAXFEV = 1000
+):
+    """
+        Least-squares fit of the simple Gaussian fitting function,
+        using its analytic Jacobian.
+
+        Input
+        ---
+        x, y : array-like
+               Binned data to be fitted.
+
+        p0 : array-like
+             Initial guesses for (A, Mu, S).
+
+        MAXFEV : int, optional
+                 Maximum number of function evaluations.
+
+        Output
+        ---
+        Returns the fit parameters and their errors.
+        Raises RuntimeError if the fit does not converge.
+    """
+
+    x = numpy.asarray(x, dtype=numpy.float64)
+    y = numpy.asarray(y, dtype=numpy.float64)
+
+    # the Jacobian is requested at the last evaluated point,
+    # so fill it along with the residuals and reuse it
+    J = numpy.empty((len(x), 3), order='F')
+    pLast = numpy.full(3, numpy.nan)
+
+    def Residual(p):
+        pLast[:] = p
+        return GausResidualJac(x, y, *p, J)
+
+    def Jacobian(p):
+        if not numpy.array_equal(p, pLast):
+            Residual(p)
+        return J
+
+    Result = scipy.optimize.least_squares(
+        Residual,
+        p0,
+        jac = Jacobian,
+        method = 'lm',
+        max_nfev = MAXFEV
+    )
+    if not Result.success:
+        raise RuntimeError(f"Optimal parameters not found: {Result.message}")
+
+    # covariance as in scipy.optimize.curve_fit, scaled by the residual variance
+    J = Result.jac
+    covs = numpy.linalg.pinv(J.T @ J) * (Result.fun @ Result.fun) / max(len(y) - len(p0), 1)
+    errs = numpy.sqrt(numpy.diag(covs))
+
+    return Result.x, errs
+
 def TripleGaus(
     x, 
     A, 
@@ -27,4 +296,34 @@ def TripleGaus(
         numpy.exp(- (x - Mu)**2 / (2 * S**2)) + \
         0.262 * numpy.exp(- (x - Mu * 1.0747)**2 / (2 * S**2)) + \
         0.077 * numpy.exp(- (x - Mu * 1.0861)**2 / (2 * S**2))
-    )
\ No newline at end of file
+    )
+
+def TripleGausJac(
+    x,
+    A,
+    Mu,
+    S
+):
+    """
+        Analytic Jacobian of the triple Gaussian fitting function,
+        with respect to the parameters (A, Mu, S).
+    """
+
+    # relative intensities and positions of the three lines
+    w = numpy.array([1., 0.262, 0.077])
+    c = numpy.array([1., 1.0747, 1.0861])
+
+    d = numpy.asarray(x, dtype=numpy.float64)[:, None] - Mu * c
+    e = w * numpy.exp(- d**2 / (2 * S**2))
+
+    return numpy.stack([
+        e.sum(axis=1),
+        A * (e * d) @ c / S**2,
+        A * (e * d**2).sum(axis=1) / S**3
+    ], axis=1)
+
+# analytic Jacobians of the fitting functions, e.g. for scipy.optimize.curve_fit(..., jac=JACOBIANS.get(f))
+JACOBIANS = {
+    Gaus: GausJac,
+    TripleGaus: TripleGausJac
+}
@@ -1,15 +1,251 @@
 import pathlib
 import re
 import shutil
-import glob
+import fnmatch
 import os
+import numpy
 import pandas
-import datetime
+import hashlib
+import functools
+import collections
+import importlib.util
+import concurrent.futures
+
+# pyarrow is optional: when available, it is used to parse large CSV files
+HAS_PYARROW = importlib.util.find_spec('pyarrow') is not None
+
+# smallest CSV file (in bytes) parsed with pyarrow: below this, e.g. for
+# single spectra, its thread-pool overhead makes it slower than the C engine
+PYARROW_MIN_BYTES = 256 * 1024
+
+# maximum number of parsed inputs kept in memory by each cached reader
+CACHE_MAXSIZE = 256
+
+def _ModificationKey(
+    Path
+):
+    """
+        Modification times identifying the content of a file,
+        or of the visible files in a directory.
+        Returns None if the path does not exist.
+    """
+
+    try:
+        if os.path.isdir(Path):
+            with os.scandir(Path) as Entries:
+                return tuple(sorted(
+                    (Entry.name, Entry.stat().st_mtime_ns)
+                    for Entry in Entries if not Entry.name.startswith('.')
+                ))
+        return os.stat(Path).st_mtime_ns
+    except OSError:
+        return None
+
+def _ReadCSV(
+    FilePath,
+    **kwargs
+):
+    """
+        Read a CSV file into a dataframe, with the multithreaded
+        pyarrow engine when available and the file is at least
+        `PYARROW_MIN_BYTES` large. Uses the default (C) engine
+        otherwise, or for options or inputs pyarrow cannot handle.
+    """
+
+    if HAS_PYARROW and os.path.isfile(FilePath) and os.path.getsize(FilePath) >= PYARROW_MIN_BYTES:
+        try:
+            return pandas.read_csv(FilePath, engine='pyarrow', **kwargs)
+        except ValueError:
+            pass
+
+    return pandas.read_csv(FilePath, **kwargs)
+
+def _ReadCSVCached(
+    FilePath,
+    **kwargs
+):
+    """
+        Read a CSV file through a hidden Parquet copy next to it,
+        which is (re)written whenever the CSV file is newer.
+        The copy is specific to the reading options. Requires pyarrow.
+    """
+
+    FilePath = pathlib.Path(FilePath)
+    OptionsHash = hashlib.md5(repr(sorted(kwargs.items())).encode()).hexdigest()[:8]
+    CachePath = FilePath.with_name(f".{FilePath.name}.{OptionsHash}.parquet")
+
+    if CachePath.exists() and CachePath.stat().st_mtime >= FilePath.stat().st_mtime:
+        return pandas.read_parquet(CachePath, engine='pyarrow')
+
+    df = _ReadCSV(FilePath, **kwargs)
+    try:
+        df.to_parquet(CachePath, engine='pyarrow', compression='snappy')
+    except OSError:
+        print(f"Could not cache {FilePath} as Parquet.")
+
+    return df
+
+def _CacheByModificationTime(
+    Function
+):
+    """
+        Cache the dataframes parsed from a path, as long as the path
+        (or the files in it) is not modified. Callers get copies,
+        so they can modify them without affecting the cache.
+    """
+
+    Cache = collections.OrderedDict()
+
+    def Copy(Result):
+        if isinstance(Result, list):
+            return [df.copy() for df in Result]
+        return Result.copy()
+
+    @functools.wraps(Function)
+    def Wrapper(Path, *args, **kwargs):
+
+        # only paths can be checked for modifications
+        if not isinstance(Path, (str, os.PathLike)):
+            return Function(Path, *args, **kwargs)
+
+        Key = (os.fspath(Path), _ModificationKey(Path), repr(args), repr(sorted(kwargs.items())))
+        if Key in Cache:
+            Cache.move_to_end(Key)
+        else:
+            Cache[Key] = Function(Path, *args, **kwargs)
+            if len(Cache) > CACHE_MAXSIZE:
+                Cache.popitem(last=False)
+
+        return Copy(Cache[Key])
+
+    return Wrapper
+
+def _ScanFiles(
+    InputPath,
+    SUFFIX
+):
+    """
+        List the files in a directory with a given suffix,
+        as directory entries (with cached name and path).
+    """
+
+    if not os.path.isdir(InputPath):
+        return []
+
+    with os.scandir(InputPath) as Entries:
+        return [Entry for Entry in Entries if Entry.name.endswith(SUFFIX) and Entry.is_file()]
+
+def _CopyFile(
+    Source,
+    Target,
+    BUFSIZE = None
+):
+    """
+        Copy a file and its permission bits.
+        With `BUFSIZE` None, use shutil.copy (which uses
+        sendfile on Linux), otherwise stream the content
+        through a buffer of `BUFSIZE` bytes, which saves
+        system calls on network filesystems.
+    """
+
+    if BUFSIZE is None:
+        shutil.copy(Source, Target)
+        return None
+
+    with open(Source, 'rb') as fIn, open(Target, 'wb') as fOut:
+        shutil.copyfileobj(fIn, fOut, length=BUFSIZE)
+    shutil.copymode(Source, Target)
+
+    return None
+
+def _MatchFiles(
+    InputPath,
+    KEY
+):
+    """
+        List the (sorted) paths of the files in a directory whose
+        name matches a glob-like `KEY`, e.g. 'F*'. Simple prefix keys
+        are checked directly, without going through fnmatch.
+        As for glob, hidden files are skipped.
+    """
+
+    if not os.path.isdir(InputPath):
+        return []
+
+    Prefix = KEY.rstrip('*')
+    if any(c in Prefix for c in '*?['):
+        Match = lambda Name: fnmatch.fnmatchcase(Name, KEY)
+    else:
+        Match = lambda Name: Name.startswith(Prefix)
+
+    with os.scandir(InputPath) as Entries:
+        return sorted(
+            Entry.path for Entry in Entries
+            if not Entry.name.startswith('.') and Match(Entry.name) and Entry.is_file()
+        )
+
+def _RouteFile(
+    FilePath,
+    TargetPath,
+    Pattern,
+    DIRNAME = '{}',
+    BUFSIZE = None
+):
+    """
+        Copy a file into the target sub-directory named after the
+        first group `Pattern` matches in its file name.
+        Files not matching are skipped.
+    """
+
+    FileName = FilePath.name
+    match = Pattern.search(FileName)
+    if not match:
+        print(f"Skipping unrecognized file: {FileName}")
+        return None
+
+    # create directory for the corresponding group
+    Directory = TargetPath/DIRNAME.format(match.group(1))
+    Directory.mkdir(parents=True, exist_ok=True)
+
+    # copy the file
+    _CopyFile(
+        FilePath,
+        Directory/FileName,
+        BUFSIZE = BUFSIZE
+    )
+
+    return None
+
+def _RouteFiles(
+    FilePaths,
+    TargetPath,
+    REGEXSTRING,
+    DIRNAME = '{}',
+    BUFSIZE = None
+):
+    """
+        Route files into target sub-directories (see `_RouteFile`),
+        overlapping the copies in a pool of threads.
+    """
+
+    RouteFile = functools.partial(
+        _RouteFile,
+        TargetPath = TargetPath,
+        Pattern = re.compile(REGEXSTRING),
+        DIRNAME = DIRNAME,
+        BUFSIZE = BUFSIZE
+    )
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=min(32, (os.cpu_count() or 1) * 4)) as Executor:
+        list(Executor.map(RouteFile, FilePaths))
+
+    return None
 
 def FormatPadovaData(
     InputPath,
     TargetPath,
-    REGEXSTRING = r"--(\d{5})\.txt$"
+    REGEXSTRING = r"--(\d{5})\.txt$",
+    BUFSIZE = None
 ):
     """
         Re-format the flat data structure from the Padova test-stand
@@ -28,6 +264,10 @@ def FormatPadovaData(
         REGEXSTRING : str, optional
                       Regex key to look for measurement numbers.
 
+        BUFSIZE : int, optional
+                  Copy buffer size in bytes (e.g., 8 * 1024**2 on
+                  network filesystems). Default uses shutil.copy.
+
         Output
         ---
         Creates a structured directory. Returns None.
@@ -39,33 +279,22 @@ def FormatPadovaData(
     if not InputPath.exists() or not InputPath.is_dir():
         print(f"Input path {InputPath} does not exist or you don't have access.")
 
-    # loop over the files in the flat data directory
-    for FilePath in InputPath.glob("*.txt"):
-
-        # extract measurement number from filename via regex
-        FileName = FilePath.name
-        match = re.search(REGEXSTRING, FileName)
-        if not match:
-            print(f"Skipping unrecognized file: {FileName}")
-            continue
-        MeasurementNumber = match.group(1) 
-
-        # create directory for the corresponding measurement
-        MeasurementDirectory = TargetPath/MeasurementNumber
-        MeasurementDirectory.mkdir(parents=True, exist_ok=True)
-
-        # copy the file
-        shutil.copy(
-            FilePath, 
-            MeasurementDirectory/FileName
-        )
+    # copy the files in the flat data directory
+    # into directories named by the measurement number
+    _RouteFiles(
+        _ScanFiles(InputPath, ".txt"),
+        TargetPath,
+        REGEXSTRING,
+        BUFSIZE = BUFSIZE
+    )
 
     return None
 
 def FormatDT5781Data(
     InputPath,
     TargetPath,
-    REGEXSTRING = r"_(\d{8}_\d{6})\.txt3$" ###< or r"(?:.*_)?([^_]+_[^_]+)\.txt3$" 
+    REGEXSTRING = r"_(\d{8}_\d{6})\.txt3$", ###< or r"(?:.*_)?([^_]+_[^_]+)\.txt3$"
+    BUFSIZE = None
 ):
     """
         Organize data files from the CAEN DT5781 into 
@@ -86,6 +315,10 @@ def FormatDT5781Data(
         REGEXSTRING : str, optional
                       Regex for extracting the timestamp (default matches YYYYMMDD_HHMMSS).
 
+        BUFSIZE : int, optional
+                  Copy buffer size in bytes (e.g., 8 * 1024**2 on
+                  network filesystems). Default uses shutil.copy.
+
         Output
         ---
         Creates a structured directory. Returns None.
@@ -97,33 +330,22 @@ def FormatDT5781Data(
     if not InputPath.exists() or not InputPath.is_dir():
         print(f"Input path {InputPath} does not exist or you don't have access.")
 
-    # loop over the files in the flat data directory
-    for FilePath in InputPath.glob("*.txt3"):
-
-        # extract measurement time from filename via regex
-        FileName = FilePath.name
-        match = re.search(REGEXSTRING, FileName)
-        if not match:
-            print(f"Skipping unrecognized file: {FileName}")
-            continue
-        Timestamp = match.group(1)  ###< e.g., "20251124_163026"
-
-        # create directory for the corresponding measurement
-        TimestampDir = TargetPath/Timestamp
-        TimestampDir.mkdir(parents=True, exist_ok=True)
-
-        # copy the file
-        shutil.copy(
-            FilePath, 
-            TimestampDir / FileName
-        )
+    # copy the files in the flat data directory
+    # into directories named by the timestamp, e.g., "20251124_163026"
+    _RouteFiles(
+        _ScanFiles(InputPath, ".txt3"),
+        TargetPath,
+        REGEXSTRING,
+        BUFSIZE = BUFSIZE
+    )
 
     return None
 
 def FormatDT5781RawData(
     InputPath,
     TargetPath,
-    REGEXSTRING = r"DataR_CH(\d+)@DT5781_.*\.CSV$"
+    REGEXSTRING = r"DataR_CH(\d+)@DT5781_.*\.CSV$",
+    BUFSIZE = None
 ):
     """
         Organize raw CSV data files from the CAEN DT5781 into 
@@ -149,6 +371,10 @@ def FormatDT5781RawData(
                       Default extracts the "CHX" from filenames 
                       like DataR_CH1@DT5781_... 
 
+        BUFSIZE : int, optional
+                  Copy buffer size in bytes (e.g., 8 * 1024**2 on
+                  network filesystems). Default uses shutil.copy.
+
         Output
         ---
         Creates a structured directory. Returns None.
@@ -160,28 +386,15 @@ def FormatDT5781RawData(
     if not InputPath.exists() or not InputPath.is_dir():
         print(f"Input path {InputPath} does not exist or you don't have access.")
 
-    # loop over the files in the flat data directory
-    for FilePath in InputPath.glob("*.CSV"): 
-
-        FileName = FilePath.name
-
-        # extract channel number via regex
-        match = re.search(REGEXSTRING, FileName)
-        if not match:
-            print(f"Skipping unrecognized file: {FileName}")
-            continue
-
-        ChannelNumber = match.group(1)  # e.g., "0", "1", ...
-
-        # create directory for this channel
-        ChannelDir = TargetPath / f"CH{ChannelNumber}"
-        ChannelDir.mkdir(parents=True, exist_ok=True)
-
-        # copy the file
-        shutil.copy(
-            FilePath,
-            ChannelDir / FileName
-        )
+    # copy the files in the flat data directory
+    # into directories named by the channel, e.g., "CH0"
+    _RouteFiles(
+        _ScanFiles(InputPath, ".CSV"),
+        TargetPath,
+        REGEXSTRING,
+        DIRNAME = "CH{}",
+        BUFSIZE = BUFSIZE
+    )
 
     return None
 
@@ -204,56 +417,101 @@ def PandasizeDT5781RawData(
         Output
         ---
         Returns a Pandas dataframe.
+        Also saves it in the channel directory, as Parquet
+        (or as pickle, if pyarrow is not available).
     """
 
     ChannelPath = pathlib.Path(ChannelPath)
-    dfs = []
+    ChannelFiles = [str(ChannelData) for ChannelData in ChannelPath.glob("*.CSV")]
 
     # merge all chopped raw data files into a df
-    for ChannelData in ChannelPath.glob("*.CSV"): 
-        df = pandas.read_csv(
-            ChannelData, 
-            skiprows=N_SKIP_LINES, names=COL_NAMES, delimiter=DELIMITER
+    if HAS_PYARROW:
+        import pyarrow
+        import pyarrow.csv
+        import pyarrow.dataset
+
+        # read all chunks in parallel, into a single table;
+        # types are fixed so that chunks cannot disagree on them
+        ColumnTypes = {'flags': pyarrow.string(), 'energy': pyarrow.int64(), TIME_VAR: pyarrow.int64()}
+        Dataset = pyarrow.dataset.dataset(
+            ChannelFiles,
+            format = pyarrow.dataset.CsvFileFormat(
+                read_options = pyarrow.csv.ReadOptions(skip_rows=N_SKIP_LINES, column_names=COL_NAMES),
+                parse_options = pyarrow.csv.ParseOptions(delimiter=DELIMITER),
+                convert_options = pyarrow.csv.ConvertOptions(
+                    column_types = {k: v for k, v in ColumnTypes.items() if k in COL_NAMES},
+                    strings_can_be_null = True
+                )
+            )
         )
-        dfs.append(df)
-    channel_df = pandas.concat(dfs, ignore_index=True)
-
-    # sort by time and add progressive time in seconds
-    channel_df[TIME_VAR] = channel_df[TIME_VAR].astype(int)
-    channel_df = channel_df.sort_values(TIME_VAR).reset_index(drop=True)
-    channel_df['time'] = (channel_df[TIME_VAR] - channel_df[TIME_VAR].iloc[0]) * 1.e-12 ###< [s]
-
-    # handle types sensibly
-    channel_df['flags'] = channel_df['flags'].apply(
-        lambda x: int(x, 16) if pandas.notna(x) else -1
-    )
-    channel_df['energy'] = channel_df['energy'].apply(
-        lambda x: int(x) if pandas.notna(x) else -1
-    )
+        # convert once, releasing the Arrow buffers along the way
+        channel_df = Dataset.to_table(use_threads=True).to_pandas(self_destruct=True, split_blocks=True)
+    else:
+        dfs = []
+        for ChannelData in ChannelFiles: 
+            df = pandas.read_csv(
+                ChannelData, 
+                skiprows=N_SKIP_LINES, names=COL_NAMES, delimiter=DELIMITER
+            )
+            dfs.append(df)
+        channel_df = pandas.concat(dfs, ignore_index=True)
+
+    # sort by time (ordering the time tags once, and reordering
+    # the df in a single take) and add progressive time in seconds
+    TimeTags = channel_df[TIME_VAR].to_numpy(dtype=numpy.int64)
+    Order = numpy.argsort(TimeTags, kind='stable')
+    TimeTags = TimeTags[Order]
+    channel_df = channel_df.take(Order).reset_index(drop=True)
+    channel_df[TIME_VAR] = TimeTags
+    channel_df['time'] = (TimeTags - TimeTags[0]) * 1.e-12 ###< [s]
+
+    # handle types sensibly: flags are hex strings with only a few
+    # distinct values, so convert those once and map them back
+    Flags = channel_df['flags']
+    channel_df['flags'] = Flags.map(
+        {Flag: int(Flag, 16) for Flag in Flags.dropna().unique()}
+    ).fillna(-1).astype('int64')
+    channel_df['energy'] = pandas.to_numeric(
+        channel_df['energy'], errors='coerce'
+    ).fillna(-1).astype('int64')
 
     # clean this up, just a bit
-    channel_df = channel_df[channel_df['energy'] > -1]
-
-    # create time bins with various flavors
-    channel_df['time_bin_1min']  = (channel_df['time'] // 60).astype(int)
-    channel_df['time_bin_5min']  = (channel_df['time'] // 300).astype(int)
-    channel_df['time_bin_10min'] = (channel_df['time'] // 600).astype(int)
-    channel_df['time_bin_30min'] = (channel_df['time'] // 1800).astype(int)
-
-    # pickle this up
-    PATH = str(ChannelPath) + "/" + ChannelPath.name + ".pkl"
-    channel_df.to_pickle(PATH)
+    channel_df = channel_df[channel_df['energy'] > -1].copy()
+
+    # create time bins with various flavors, in one broadcast pass
+    t = channel_df['time'].to_numpy(dtype=numpy.float64)
+    Bins = (t[:, None] // numpy.array([60., 300., 600., 1800.])).astype('int32')
+    for i, Name in enumerate(['time_bin_1min', 'time_bin_5min', 'time_bin_10min', 'time_bin_30min']):
+        channel_df[Name] = Bins[:, i]
+
+    # shrink the dtypes: the integer columns only have small values,
+    # and the time (once binned in double precision) fits in a float
+    for Column in ('board', 'channel', 'flags'):
+        if Column in channel_df:
+            channel_df[Column] = pandas.to_numeric(channel_df[Column], downcast='integer')
+    channel_df['energy'] = channel_df['energy'].astype('int32')
+    channel_df['time'] = t.astype('float32')
+
+    # save this up, as Parquet if possible
+    if HAS_PYARROW:
+        PATH = str(ChannelPath) + "/" + ChannelPath.name + ".parquet"
+        channel_df.to_parquet(PATH, engine='pyarrow', compression='snappy', index=False)
+    else:
+        PATH = str(ChannelPath) + "/" + ChannelPath.name + ".pkl"
+        channel_df.to_pickle(PATH)
     print(f"Saved merged DataFrame to: {PATH}")
 
     return channel_df
 
+@_CacheByModificationTime
 def ExtractSingleMeasurement(
     FilePath,
     IS_CSV = False,
     CHANNEL_KEY = 'F*',
     N_SKIP_LINES = 5,
     COL_NAMES = ['BinCenter', 'Population'],
-    DELIMITER = ';'
+    DELIMITER = ';',
+    CACHE_PARQUET = False
 ):
     """
         Input
@@ -265,24 +523,34 @@ def ExtractSingleMeasurement(
                  Whether to expect a CSV file, 
                  e.g., from CERN data starting Jan. 2026.
 
+        CACHE_PARQUET : bool, optional
+                        Whether to keep a hidden Parquet copy of each
+                        parsed file next to it, to be read instead on
+                        later calls. Requires pyarrow.
+
         Output
         ---
         Provides channel data to be analyzed or plotted.
         Returns a list of dataframes.
     """
 
+    if CACHE_PARQUET and not HAS_PYARROW:
+        print("Parquet caching requires pyarrow, reading CSV files directly.")
+        CACHE_PARQUET = False
+    ReadCSV = _ReadCSVCached if CACHE_PARQUET else _ReadCSV
+
     if not IS_CSV:
         # find and sort all files starting with 'F'
-        FileList = sorted(glob.glob(os.path.join(FilePath, CHANNEL_KEY)))
+        FileList = _MatchFiles(FilePath, CHANNEL_KEY)
 
         # read all files into a list of DataFrames
         Data = [
-            pandas.read_csv(f, skiprows=N_SKIP_LINES, names=COL_NAMES, delimiter=DELIMITER)
+            ReadCSV(f, skiprows=N_SKIP_LINES, names=COL_NAMES, delimiter=DELIMITER)
             for f in FileList
         ]
     else:
         # in the CSV format (as of March, 2026) all channels come from the same file
-        DataAll = pandas.read_csv(FilePath, names=COL_NAMES, delimiter=DELIMITER, skiprows=1)
+        DataAll = ReadCSV(FilePath, names=COL_NAMES, delimiter=DELIMITER, skiprows=1)
 
         # split into different dataframes, and bring everything back to the 'old' structure
         Data = [
@@ -292,6 +560,7 @@ def ExtractSingleMeasurement(
 
     return Data
 
+@_CacheByModificationTime
 def ExtractFileTimes(
     TimeMapping,
     DELIMITER = '  ',
@@ -328,11 +597,12 @@ def ExtractFileTimes(
         engine = 'python',
         names = COL_NAMES
     )
-    FileTimes['FileName'] = FileTimes['Name'].apply(os.path.basename)
-    FileTimes['Date'] = FileTimes['Date'].apply(lambda date: datetime.datetime.strptime(date, "%m-%d-%Y %H:%M"))
+    FileTimes['FileName'] = FileTimes['Name'].str.rsplit('/', n=1).str[-1]
+    FileTimes['Date'] = pandas.to_datetime(FileTimes['Date'], format="%m-%d-%Y %H:%M", cache=True)
 
     return FileTimes
 
+@_CacheByModificationTime
 def ExtractTemperatureMonitoring(
     TemperatureLog,
     IsPadova = True,
@@ -353,6 +623,7 @@ def ExtractTemperatureMonitoring(
                   Defaults:
                     delimiter = " "
                     names = ["DateRaw", "Time", "T1", "T2"]
+                    engine = "c"
 
         Output
         ---
@@ -363,7 +634,7 @@ def ExtractTemperatureMonitoring(
     defaults = dict(
         delimiter = " ",
         names = ["DateRaw", "Time", "T1", "T2"],
-        engine = "python",
+        engine = "c",
     )
     kwargs = {**defaults, **kwargs}
 
@@ -375,7 +646,8 @@ def ExtractTemperatureMonitoring(
     if IsPadova:
         FileTemperatures['Date'] = pandas.to_datetime(
             FileTemperatures['DateRaw'] + ' ' + FileTemperatures['Time'], 
-            format='%d.%m.%Y %H:%M'
+            format='%d.%m.%Y %H:%M',
+            cache=True
         )
         FileTemperatures['Date_Shifted'] = FileTemperatures['Date'] + pandas.Timedelta(minutes=12) ###< Known delay
 
@@ -1,7 +1,7 @@
 import numpy
-import scipy
+import matplotlib
 
-from pmana.utils.fitting import Gaus
+from pmana.utils.fitting import Gaus, GausMoments, FitGaus
 
 def PlotTimeSeriesWithErrors(
     ax,
@@ -134,6 +134,7 @@ def PlotSingleChannel(
     rebin = False,
     debug = False,
     DISPLAY_FIT = True,
+    PRECISE_FIT = True,
     SKIP_NROWS = 0,
     BINNAME = 'BinCenter',
     COUNTNAME = 'Population'
@@ -157,58 +158,71 @@ def PlotSingleChannel(
                  consistent color-coding for plots
                  with multiple channels.
 
+        PRECISE_FIT: bool, optional
+                 Refine the moment estimates of the peak
+                 with a short Gaussian fit. If False,
+                 the moment estimates are displayed.
+
         ---
         Output:
 
         Plot the channel data. Returns None.
     """
 
+    # fetch the channel columns once, as arrays
+    BinCenters = CHData[BINNAME].to_numpy(dtype=numpy.float64)
+    y = CHData[COUNTNAME].to_numpy(dtype=numpy.float64)
     if SKIP_NROWS > 0:
         print(f"Skipping the first {SKIP_NROWS} rows.")
-        CHData = CHData.iloc[SKIP_NROWS:].reset_index(drop=True)
-
-    # adaptively extract bin edges
-    Diffs = numpy.diff(sorted(CHData[BINNAME]))
+        BinCenters = BinCenters[SKIP_NROWS:]
+        y = y[SKIP_NROWS:]
+
+    # adaptively extract bin edges, sorting only unordered bins
+    if numpy.all(BinCenters[1:] >= BinCenters[:-1]):
+        Diffs = numpy.diff(BinCenters)
+    else:
+        Diffs = numpy.diff(numpy.sort(BinCenters))
     BinWidth = round(numpy.median(Diffs), 6)
-    BinEdges = numpy.append(CHData[BINNAME] - BinWidth / 2, CHData[BINNAME].iloc[-1] + BinWidth / 2)
+    BinEdges = numpy.empty(BinCenters.size + 1)
+    BinEdges[:-1] = BinCenters - BinWidth / 2
+    BinEdges[-1] = BinCenters[-1] + BinWidth / 2
+
+    # data is already binned: use the populations as they are
     if rebin:
         BinEdges = BinEdges[::2]
+        y = y[:len(y) // 2 * 2].reshape(-1, 2).sum(axis=1)
     
     # plot channel data
-    y, bins, _ = ax.hist(
-        CHData[BINNAME],
-        bins = BinEdges,
-        weights = CHData[COUNTNAME],
+    ax.stairs(
+        y,
+        BinEdges,
+        fill=True,
+        lw=matplotlib.rcParams['patch.linewidth'], ###< filled stairs default to no outline
         alpha=0.5,
-        histtype="stepfilled",
         label=f"CH{channel}",
         fc=f"C{channel}",
         ec=f"C{channel}"
     )
-    x = (bins[:-1] + bins[1:]) / 2
+    x = BinEdges[:-1] + BinEdges[1:]
+    x *= 0.5
 
     if DISPLAY_FIT:
-        # extract channel features
-        idxMax = numpy.argmax(y); posMax = x[idxMax] ###< peak position in ticks
-        # std = (max(x) - min(x)) / 2.355
-        indices = numpy.where(y > 0.1 * max(y))[0]
-        std = (x[indices[-1]] - x[indices[0]]) / 2.355
-
-        # perform Gaussian fit of channel
-        try:
-            pars, covs = scipy.optimize.curve_fit(
-                Gaus, 
-                x,
-                y,
-                p0 = (numpy.max(CHData[COUNTNAME]), posMax, std),
-                maxfev=1000
-            )
-            errs = numpy.sqrt(numpy.diag(covs))
-        except RuntimeError:
-            print(f"Could not perform fit for channel {channel}.")
-            print(f"Initial guesses: {idxMax}, {std}")
-            pars = numpy.ones(3)
-            errs = numpy.ones(3)
+        # extract channel features from weighted moments: peak height, position (in ticks) and width
+        Guess = GausMoments(x, y)
+        if Guess is None:
+            print(f"Could not perform fit for channel {channel}: insufficient bins above threshold.")
+            return None
+        _, posMax, std = Guess
+        pars = numpy.array(Guess)
+        errs = numpy.full(3, numpy.nan)
+
+        # refine with a short Gaussian fit of channel, starting from the moments
+        if PRECISE_FIT:
+            try:
+                pars, errs = FitGaus(x, y, Guess, MAXFEV=20)
+            except RuntimeError:
+                print(f"Could not perform fit for channel {channel}, using moment estimates.")
+                print(f"Initial guesses: {posMax}, {std}")
         
         if debug:
             print(f"Peak position: {posMax}")